@@ -3,9 +3,18 @@ CONFIG = {
     'input_source': 'test_assets/user_face.jpg', # Path to file for file mode
     'target_face': 'faces/target_face.jpg',
     'output_path': 'output/',
+    'batch_size': 1,  # Frames per batch in file mode (video only)
+    'workers': 1,  # Worker processes for file mode (video only); target face is shared, not copied
+    'worker_slots': 4,  # Frames in flight per worker
+    'worker_run_length': 30,  # Consecutive frames each worker gets per batch
     'width': 640,
     'height': 480,
     'fps': 30,
+    'vcam_format': 'RGB',  # 'BGR' skips color conversion if the virtual camera backend supports it
     'blend_ratio': 1.0,
-    'color_correction': True
+    'color_correction': True,
+    'frame_skip': True,  # Reuse the previous result while the scene is static
+    'skip_roi_threshold': 3.0,  # Max mean gray difference in any block of the face ROI
+    'skip_landmark_threshold': 2.5,  # Mean landmark movement in pixels
+    'skip_max_reuse': 30  # Force a full pass after this many skipped frames
 }
@@ -0,0 +1,95 @@
+import cv2
+import numpy as np
+
+def merge_metrics(metrics):
+    """
+    Sums ChangeDetector.metrics() dicts, e.g. from several workers, and
+    recomputes the rates.
+    """
+    totals = {key: sum(m[key] for m in metrics) for key in ('frames', 'skipped', 'reused')}
+    frames = max(totals['frames'], 1)
+    totals['skip_rate'] = totals['skipped'] / frames
+    totals['reuse_rate'] = totals['reused'] / frames
+    return totals
+
+class ChangeDetector:
+    def __init__(self, roi_threshold=3.0, landmark_threshold=2.5, thumb_size=(32, 32), block_size=4, max_reuse=30):
+        """
+        Decides whether a frame is close enough to the last processed one
+        that the previous swap result can be reused.
+
+        roi_threshold: Largest mean absolute gray difference (0-255) allowed in any
+                       block of the downsampled face ROI
+        landmark_threshold: Mean landmark movement in pixels. MediaPipe jitters by
+                            about 1 px on average on a still face, single points
+                            by several px, so the mean is compared, not the max.
+        thumb_size: Size the face ROI is downsampled to before comparing
+        block_size: Side of the thumbnail blocks the difference is averaged over
+        max_reuse: Force a full pass after this many consecutive skipped frames
+        """
+        self.roi_threshold = roi_threshold
+        self.landmark_threshold = landmark_threshold
+        self.thumb_size = thumb_size
+        self.block_size = block_size
+        self.max_reuse = max_reuse
+
+        self.frames = 0
+        self.skipped = 0
+        self.reused = 0
+        self.reset()
+
+    def reset(self):
+        self.ref_thumb = None
+        self.ref_landmarks = None
+        self.reuse_count = 0
+
+    def roi_thumbnail(self, frame, rect):
+        """
+        Returns a small grayscale thumbnail of the rect (x, y, w, h) in frame.
+        """
+        x, y, w, h = rect
+        frame_h, frame_w = frame.shape[:2]
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, frame_w), min(y + h, frame_h)
+        if x1 <= x0 or y1 <= y0:
+            return None
+
+        roi = cv2.cvtColor(frame[y0:y1, x0:x1], cv2.COLOR_BGR2GRAY)
+        return cv2.resize(roi, self.thumb_size, interpolation=cv2.INTER_AREA)
+
+    def roi_changed(self, thumb):
+        """
+        Compares a thumbnail against the one stored at the last blend.
+        """
+        if thumb is None or self.ref_thumb is None or self.reuse_count >= self.max_reuse:
+            return True
+        diff = cv2.absdiff(thumb, self.ref_thumb)
+        # Judge by the worst block, not the whole ROI: a blink or a moving
+        # mouth only touches a few blocks and vanishes in a global mean.
+        w, h = self.thumb_size
+        blocks = cv2.resize(diff, (w // self.block_size, h // self.block_size), interpolation=cv2.INTER_AREA)
+        return float(blocks.max()) > self.roi_threshold
+
+    def landmarks_changed(self, landmarks):
+        if self.ref_landmarks is None:
+            return True
+        dist = np.linalg.norm(np.asarray(landmarks) - self.ref_landmarks, axis=1)
+        return float(dist.mean()) > self.landmark_threshold
+
+    def update(self, thumb=None, landmarks=None):
+        """
+        Stores the reference state after a blend. Thumbnail and landmarks
+        are only replaced when given.
+        """
+        if thumb is not None:
+            self.ref_thumb = thumb
+        if landmarks is not None:
+            self.ref_landmarks = np.asarray(landmarks)
+        self.reuse_count = 0
+
+    def metrics(self):
+        """
+        Returns skip (detection + blend skipped) and reuse (warp reused,
+        re-blended) counters and rates.
+        """
+        return merge_metrics([{'frames': self.frames, 'skipped': self.skipped, 'reused': self.reused}])
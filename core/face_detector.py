@@ -13,15 +13,18 @@ class FaceDetector:
             min_detection_confidence=min_detection_confidence,
             min_tracking_confidence=min_tracking_confidence
         )
+        self._rgb_buffer = None
 
     def get_landmarks(self, image):
         """
         Detects face landmarks in the given image.
         Returns a list of (x, y) tuples for the first detected face.
         """
-        # Convert BGR to RGB
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        results = self.face_mesh.process(image_rgb)
+        # Convert BGR to RGB into a reused buffer instead of allocating one per call
+        if self._rgb_buffer is None or self._rgb_buffer.shape != image.shape:
+            self._rgb_buffer = np.empty_like(image)
+        cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self._rgb_buffer)
+        results = self.face_mesh.process(self._rgb_buffer)
 
         if results.multi_face_landmarks:
             # We only take the first face
@@ -29,3 +32,12 @@ class FaceDetector:
             h, w, _ = image.shape
             return normalize_landmarks(face_landmarks.landmark, w, h)
         return None
+
+    def get_landmarks_batch(self, images):
+        """
+        Detects face landmarks in a batch of images, given as a (B, H, W, 3)
+        array or a list of images. Frames are processed in order, so tracking
+        state carries over between them as with get_landmarks.
+        Returns a list with the same result get_landmarks gives, per image.
+        """
+        return [self.get_landmarks(image) for image in images]
@@ -0,0 +1,53 @@
+from multiprocessing import shared_memory
+import numpy as np
+
+class SharedTargetAssets:
+    def __init__(self, blocks, arrays, owner):
+        self.blocks = blocks
+        self.arrays = arrays
+        self.owner = owner
+
+    @classmethod
+    def create(cls, **arrays):
+        """
+        Copies each array into its own shared memory block.
+        Pass descriptor() to workers and open it there with attach().
+        """
+        blocks = {}
+        views = {}
+        for key, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+            view = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+            view[...] = arr
+            blocks[key] = shm
+            views[key] = view
+        return cls(blocks, views, owner=True)
+
+    @classmethod
+    def attach(cls, descriptor):
+        """
+        Maps the blocks described by descriptor without copying.
+        """
+        blocks = {}
+        views = {}
+        for key, (name, shape, dtype) in descriptor.items():
+            shm = shared_memory.SharedMemory(name=name)
+            blocks[key] = shm
+            views[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        return cls(blocks, views, owner=False)
+
+    def descriptor(self):
+        """
+        Picklable {key: (block name, shape, dtype)} mapping.
+        """
+        return {key: (self.blocks[key].name, view.shape, view.dtype.str) for key, view in self.arrays.items()}
+
+    def close(self):
+        # Views must go before the blocks can be closed
+        self.arrays = {}
+        for shm in self.blocks.values():
+            shm.close()
+            if self.owner:
+                shm.unlink()
+        self.blocks = {}
@@ -0,0 +1,96 @@
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+
+END_OF_STREAM = -1
+
+class SharedFrameRing:
+    def __init__(self, shape, slots=4, ctx=None):
+        """
+        Single-producer, single-consumer ring of frames in shared memory.
+        Frames are written and read in place, nothing is pickled. Pass the
+        ring to a multiprocessing.Process as an argument to share it.
+
+        shape: Frame shape, e.g. (480, 640, 3); frames are uint8
+        slots: Number of frames that can be in the ring at once
+        """
+        ctx = ctx or multiprocessing
+        self.shape = tuple(shape)
+        self.slots = slots
+        self.frame_size = int(np.prod(self.shape))
+
+        # Layout: one int64 sequence number per slot, then the frame data
+        self.shm = shared_memory.SharedMemory(create=True, size=slots * 8 + slots * self.frame_size)
+        self.owner = True
+        self.free = ctx.Semaphore(slots)
+        self.filled = ctx.Semaphore(0)
+        self._map()
+
+    def _map(self):
+        self.seqs = np.ndarray((self.slots,), dtype=np.int64, buffer=self.shm.buf)
+        self.frames = np.ndarray((self.slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf, offset=self.slots * 8)
+        # Each side only moves its own index
+        self.write_index = 0
+        self.read_index = 0
+
+    def __getstate__(self):
+        return {
+            'name': self.shm.name,
+            'shape': self.shape,
+            'slots': self.slots,
+            'free': self.free,
+            'filled': self.filled
+        }
+
+    def __setstate__(self, state):
+        self.shape = state['shape']
+        self.slots = state['slots']
+        self.frame_size = int(np.prod(self.shape))
+        self.shm = shared_memory.SharedMemory(name=state['name'])
+        self.owner = False
+        self.free = state['free']
+        self.filled = state['filled']
+        self._map()
+
+    def acquire_write(self, timeout=None):
+        """
+        Waits until a slot is free and returns it for writing in place.
+        Returns None if timeout (seconds) expires first.
+        """
+        if not self.free.acquire(timeout=timeout):
+            return None
+        return self.frames[self.write_index]
+
+    def commit_write(self, seq):
+        self.seqs[self.write_index] = seq
+        self.write_index = (self.write_index + 1) % self.slots
+        self.filled.release()
+
+    def put(self, frame, seq):
+        self.acquire_write()[...] = frame
+        self.commit_write(seq)
+
+    def put_end(self):
+        self.free.acquire()
+        self.commit_write(END_OF_STREAM)
+
+    def acquire_read(self, timeout=None):
+        """
+        Waits until a frame is available. Returns (seq, frame view); the
+        view stays valid until release_read(). seq is END_OF_STREAM after put_end().
+        Returns None if timeout (seconds) expires first.
+        """
+        if not self.filled.acquire(timeout=timeout):
+            return None
+        return int(self.seqs[self.read_index]), self.frames[self.read_index]
+
+    def release_read(self):
+        self.read_index = (self.read_index + 1) % self.slots
+        self.free.release()
+
+    def close(self):
+        self.seqs = None
+        self.frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -1,40 +1,180 @@
-import pyvirtualcam
+import threading
+import time
 import numpy as np
 import cv2
 
+try:
+    import pyvirtualcam
+except ImportError:
+    pyvirtualcam = None
+
+class FakeCamera:
+    """
+    In-memory stand-in for pyvirtualcam.Camera.
+    Keeps copies of the last `max_frames` frames, or appends raw frame bytes
+    to `path` if one is given.
+    """
+    def __init__(self, width, height, fps, fmt='RGB', path=None, max_frames=100):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.fmt = fmt
+        self.device = path or 'fake'
+        self.frames = []
+        self.max_frames = max_frames
+        self.frames_sent = 0
+        self._file = open(path, 'wb') if path else None
+        self._next_frame = time.perf_counter()
+
+    def send(self, frame):
+        if frame.shape != (self.height, self.width, 3):
+            raise ValueError(f"Frame shape {frame.shape} does not match {(self.height, self.width, 3)}")
+        if self._file:
+            self._file.write(frame.tobytes())
+        else:
+            self.frames.append(frame.copy())
+            del self.frames[:-self.max_frames]
+        self.frames_sent += 1
+
+    def sleep_until_next_frame(self):
+        self._next_frame += 1.0 / self.fps
+        delay = self._next_frame - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            self._next_frame = time.perf_counter()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
 class VirtualCamera:
-    def __init__(self, width=640, height=480, fps=30):
+    def __init__(self, width=640, height=480, fps=30, fmt='RGB', camera_factory=None):
+        """
+        width, height, fps: Output device settings
+        fmt: Device pixel format, 'RGB' or 'BGR'. Use 'BGR' if the backend
+             supports it to skip color conversion for OpenCV frames.
+        camera_factory: Callable(width, height, fps, fmt) returning a camera
+             object. Defaults to pyvirtualcam; pass FakeCamera for testing.
+        """
         self.width = width
         self.height = height
         self.fps = fps
+        self.fmt = fmt
+        self.camera_factory = camera_factory or self._pyvirtualcam_factory
         self.cam = None
         self.active = False
+        # Exception raised by the device on the pacing thread, reported by send()/stop()
+        self.error = None
+
+        # Three preallocated output buffers: one being written by send(),
+        # one pending, one being sent by the pacing thread.
+        self._buffers = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(3)]
+        self._resize_buffer = np.empty((height, width, 3), dtype=np.uint8)
+        self._pending = None
+        self._front = None
+        self._cond = threading.Condition()
+        self._thread = None
+
+    @staticmethod
+    def _pyvirtualcam_factory(width, height, fps, fmt):
+        if pyvirtualcam is None:
+            raise RuntimeError("pyvirtualcam is not installed")
+        return pyvirtualcam.Camera(width=width, height=height, fps=fps, fmt=pyvirtualcam.PixelFormat[fmt])
 
     def start(self):
+        self.error = None
+        self._pending = None
+        self._front = None
         try:
-            self.cam = pyvirtualcam.Camera(width=self.width, height=self.height, fps=self.fps)
+            self.cam = self.camera_factory(self.width, self.height, self.fps, self.fmt)
             self.active = True
             print(f"Virtual Camera started: {self.cam.device}")
-            return True
         except Exception as e:
             print(f"Error starting virtual camera: {e}")
             print("Ensure OBS Virtual Camera or v4l2loopback is installed and active.")
             self.active = False
             return False
 
-    def send(self, frame):
-        if self.active and self.cam:
-            # pyvirtualcam expects RGB, OpenCV uses BGR
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # Ensure size matches
-            if frame.shape[1] != self.width or frame.shape[0] != self.height:
-                frame_rgb = cv2.resize(frame_rgb, (self.width, self.height))
-                
-            self.cam.send(frame_rgb)
-            self.cam.sleep_until_next_frame()
+        self._thread = threading.Thread(target=self._pacing_loop)
+        self._thread.daemon = True
+        self._thread.start()
+        return True
+
+    def _free_buffer(self):
+        for buf in self._buffers:
+            if buf is not self._pending and buf is not self._front:
+                return buf
+
+    def send(self, frame, fmt='BGR'):
+        """
+        Queues a frame for output and returns immediately.
+        fmt is the pixel format of `frame`. If it already matches the device
+        format and size, the array is handed to the device as is and must not
+        be modified by the caller afterwards. Otherwise it is resized (first,
+        while still in the source format) and converted into a reusable buffer.
+        Raises the device error if the pacing thread stopped on one.
+        """
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+        if not (self.active and self.cam):
+            return
+
+        same_size = frame.shape[1] == self.width and frame.shape[0] == self.height
+        with self._cond:
+            buf = self._free_buffer()
+
+        if same_size and fmt == self.fmt:
+            out = frame
+        else:
+            src = frame
+            if not same_size:
+                # Resize before converting so conversion runs on output-sized pixels
+                dst = buf if fmt == self.fmt else self._resize_buffer
+                src = cv2.resize(frame, (self.width, self.height), dst=dst)
+            if fmt != self.fmt:
+                # RGB <-> BGR is the same channel swap either way
+                cv2.cvtColor(src, cv2.COLOR_BGR2RGB, dst=buf)
+            out = buf
+
+        with self._cond:
+            self._pending = out
+            self._cond.notify()
+
+    def _pacing_loop(self):
+        # Runs on its own thread so frame pacing never blocks processing.
+        # Repeats the last frame if no new one arrived in time.
+        while True:
+            with self._cond:
+                while self.active and self._pending is None and self._front is None:
+                    self._cond.wait()
+                if not self.active:
+                    break
+                if self._pending is not None:
+                    self._front = self._pending
+                    self._pending = None
+                frame = self._front
+
+            try:
+                self.cam.send(frame)
+                self.cam.sleep_until_next_frame()
+            except Exception as e:
+                with self._cond:
+                    self.error = e
+                    self.active = False
+                break
 
     def stop(self):
+        with self._cond:
+            self.active = False
+            self._cond.notify()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
         if self.cam:
             self.cam.close()
-            self.active = False
+        if self.error is not None:
+            print(f"Virtual camera stopped on error: {self.error}")
+            self.error = None
@@ -0,0 +1,168 @@
+import multiprocessing
+import queue
+import traceback
+import numpy as np
+from io_module.frame_ring import SharedFrameRing, END_OF_STREAM
+from core.change_detector import merge_metrics
+
+def _worker_loop(app_factory, assets_descriptor, in_ring, out_ring, metrics_queue):
+    app = None
+    try:
+        app = app_factory(assets_descriptor)
+        while True:
+            seq, frame = in_ring.acquire_read()
+            if seq == END_OF_STREAM:
+                in_ring.release_read()
+                break
+            output = app.process_frame(frame)
+            out_ring.put(output, seq)
+            in_ring.release_read()
+    except Exception:
+        traceback.print_exc()
+    finally:
+        if app is not None:
+            metrics_queue.put(app.get_metrics())
+        # Always send the end marker so the pool never waits on a failed worker
+        out_ring.put_end()
+        # Drop views into the rings before unmapping them
+        frame = output = None
+        if app is not None:
+            app.release_target_assets()
+        in_ring.close()
+        out_ring.close()
+
+class WorkerPool:
+    def __init__(self, app_factory, assets, workers=2, slots=4, poll_interval=0.5, join_timeout=5.0):
+        """
+        Runs process_frame in worker processes.
+        Target assets are read from shared memory and frames move through
+        one pair of SharedFrameRings per worker, so nothing is pickled per frame.
+
+        app_factory: Picklable callable taking the assets descriptor and returning
+                     an object with process_frame(frame), get_metrics() and
+                     release_target_assets(), e.g. functools.partial(FaceSwapApp, config)
+        assets: SharedTargetAssets created by FaceSwapApp.share_target_assets()
+        poll_interval: Seconds between checks that the workers are still alive
+        join_timeout: Seconds close() waits for a worker to exit before terminating it
+        """
+        self.app_factory = app_factory
+        self.assets = assets
+        self.workers = workers
+        self.slots = slots
+        self.poll_interval = poll_interval
+        self.join_timeout = join_timeout
+        self.ctx = multiprocessing.get_context('spawn')
+        self.processes = []
+        self.in_rings = []
+        self.out_rings = []
+        self.finished = []
+        self.shape = None
+        self.outputs = None
+        self.metrics_queue = self.ctx.Queue()
+        # Summed worker metrics, filled in by close()
+        self.metrics = None
+
+    def start(self, shape):
+        self.shape = tuple(shape)
+        for _ in range(self.workers):
+            in_ring = SharedFrameRing(self.shape, self.slots, self.ctx)
+            out_ring = SharedFrameRing(self.shape, self.slots, self.ctx)
+            p = self.ctx.Process(target=_worker_loop, args=(self.app_factory, self.assets.descriptor(), in_ring, out_ring, self.metrics_queue))
+            p.daemon = True
+            p.start()
+            self.processes.append(p)
+            self.in_rings.append(in_ring)
+            self.out_rings.append(out_ring)
+            self.finished.append(False)
+
+    def _wait(self, k, acquire):
+        """
+        Calls acquire(timeout) until it succeeds, raising if worker k has died.
+        """
+        while True:
+            result = acquire(self.poll_interval)
+            if result is not None:
+                return result
+            p = self.processes[k]
+            if not p.is_alive():
+                self.finished[k] = True
+                raise RuntimeError(f"Face swap worker {k} exited with code {p.exitcode}")
+
+    def _submit(self, k, frame, seq):
+        in_ring = self.in_rings[k]
+        self._wait(k, in_ring.acquire_write)[...] = frame
+        in_ring.commit_write(seq)
+
+    def _collect(self, k):
+        out_ring = self.out_rings[k]
+        seq, frame = self._wait(k, out_ring.acquire_read)
+        if seq == END_OF_STREAM:
+            out_ring.release_read()
+            self.finished[k] = True
+            raise RuntimeError(f"Face swap worker {k} failed, see its traceback above")
+        self.outputs[seq] = frame
+        out_ring.release_read()
+
+    def process_frames(self, frames):
+        """
+        Same contract as FaceSwapApp.process_frames. Each worker gets one
+        contiguous run of the batch, so its tracker and change detector see
+        consecutive frames. The returned array is reused by the next call.
+        Raises RuntimeError if a worker fails.
+        """
+        if self.shape is None:
+            self.start(frames[0].shape)
+        if self.outputs is None or len(self.outputs) < len(frames):
+            self.outputs = np.empty((len(frames),) + self.shape, dtype=np.uint8)
+
+        runs = np.array_split(np.arange(len(frames)), self.workers)
+        submitted = [0] * self.workers
+        collected = [0] * self.workers
+        while any(collected[k] < len(run) for k, run in enumerate(runs)):
+            # At most `slots` frames in flight per worker, so neither ring can fill up
+            for k, run in enumerate(runs):
+                while submitted[k] < len(run) and submitted[k] - collected[k] < self.slots:
+                    seq = int(run[submitted[k]])
+                    self._submit(k, frames[seq], seq)
+                    submitted[k] += 1
+            for k in range(self.workers):
+                if collected[k] < submitted[k]:
+                    self._collect(k)
+                    collected[k] += 1
+        return self.outputs[:len(frames)]
+
+    def close(self):
+        try:
+            for k, (in_ring, out_ring) in enumerate(zip(self.in_rings, self.out_rings)):
+                if self.finished[k] or not self.processes[k].is_alive():
+                    continue
+                try:
+                    self._wait(k, in_ring.acquire_write)
+                    in_ring.commit_write(END_OF_STREAM)
+                    # Drain up to the worker's end marker
+                    while self._wait(k, out_ring.acquire_read)[0] != END_OF_STREAM:
+                        out_ring.release_read()
+                    out_ring.release_read()
+                    self.finished[k] = True
+                except RuntimeError as e:
+                    print(f"Error stopping worker pool: {e}")
+        finally:
+            for p in self.processes:
+                # Workers tear down MediaPipe after their end marker, give them time
+                p.join(self.join_timeout)
+                if p.is_alive():
+                    p.terminate()
+                    p.join()
+            for ring in self.in_rings + self.out_rings:
+                ring.close()
+            worker_metrics = []
+            while True:
+                try:
+                    worker_metrics.append(self.metrics_queue.get(timeout=self.poll_interval))
+                except queue.Empty:
+                    break
+            self.metrics = merge_metrics(worker_metrics)
+            self.processes = []
+            self.in_rings = []
+            self.out_rings = []
+            self.finished = []
@@ -1,31 +1,51 @@
 import cv2
 import sys
 import os
+import functools
 import numpy as np
 from config import CONFIG
 from core.face_detector import FaceDetector
 from core.face_swapper import FaceSwapper
 from core.blender import Blender
+from core.change_detector import ChangeDetector
 from core.utils import get_face_mask
 
 class FaceSwapApp:
-    def __init__(self, config):
+    def __init__(self, config, shared_assets=None):
+        """
+        shared_assets: Descriptor from SharedTargetAssets.descriptor(). If given,
+        the target face is mapped from shared memory instead of loaded from disk.
+        """
         self.config = config
         self.detector = FaceDetector()
         self.swapper = FaceSwapper()
         self.blender = Blender()
+        self.change_detector = ChangeDetector(
+            roi_threshold=self.config.get('skip_roi_threshold', 3.0),
+            landmark_threshold=self.config.get('skip_landmark_threshold', 2.5),
+            max_reuse=self.config.get('skip_max_reuse', 30)
+        )
         
         self.target_img = None
         self.target_landmarks = None
         self.target_triangles = None
+        self.target_tri_pts = None
         
-        self.load_target_face(self.config['target_face'])
+        # Result of the last full swap, reused while the scene is static
+        self.last_swap = None
+        self.shared_assets = None
+        
+        if shared_assets is not None:
+            self.attach_target_assets(shared_assets)
+        else:
+            self.load_target_face(self.config['target_face'])
 
     def load_target_face(self, path):
         if not os.path.exists(path):
             print(f"Target face not found: {path}")
             return
             
+        self.release_target_assets()
         self.target_img = cv2.imread(path)
         self.target_landmarks = self.detector.get_landmarks(self.target_img)
         
@@ -33,30 +53,150 @@ class FaceSwapApp:
             print(f"No face detected in target image: {path}")
             return
 
-        self.target_triangles = self.swapper.get_triangles(self.target_landmarks)
+        self.target_triangles = np.array(self.swapper.get_triangles(self.target_landmarks), dtype=np.int32).reshape(-1, 3)
+        # Triangle vertices in the target image, (T, 3, 2)
+        self.target_tri_pts = np.asarray(self.target_landmarks)[self.target_triangles]
         print(f"Loaded target face: {path} with {len(self.target_landmarks)} landmarks.")
 
+    def share_target_assets(self):
+        """
+        Copies the loaded target face into shared memory for worker processes.
+        The caller owns the returned SharedTargetAssets and must close() it.
+        """
+        from core.shared_assets import SharedTargetAssets
+        return SharedTargetAssets.create(
+            img=self.target_img,
+            landmarks=np.asarray(self.target_landmarks, dtype=np.int32),
+            triangles=self.target_triangles,
+            tri_pts=self.target_tri_pts
+        )
+
+    def attach_target_assets(self, descriptor):
+        from core.shared_assets import SharedTargetAssets
+        self.release_target_assets()
+        self.shared_assets = SharedTargetAssets.attach(descriptor)
+        arrays = self.shared_assets.arrays
+        self.target_img = arrays['img']
+        self.target_landmarks = arrays['landmarks']
+        self.target_triangles = arrays['triangles']
+        self.target_tri_pts = arrays['tri_pts']
+
+    def release_target_assets(self):
+        self.clear_swap_cache()
+        if self.shared_assets is not None:
+            self.target_img = None
+            self.target_landmarks = None
+            self.target_triangles = None
+            self.target_tri_pts = None
+            self.shared_assets.close()
+            self.shared_assets = None
+
+    def clear_swap_cache(self):
+        self.last_swap = None
+        self.change_detector.reset()
+
+    def get_metrics(self):
+        return self.change_detector.metrics()
+
+    def reuse_output(self, frame):
+        """
+        Pastes the face region of the last output onto the current frame.
+        Pixels outside the face ROI always come from the current frame.
+        """
+        x, y, w, h = self.last_swap['rect']
+        frame_h, frame_w = frame.shape[:2]
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, frame_w), min(y + h, frame_h)
+
+        output = frame.copy()
+        output[y0:y1, x0:x1] = self.last_swap['output'][y0:y1, x0:x1]
+        return output
+
     def process_frame(self, frame):
         if self.target_img is None or self.target_landmarks is None:
             return frame
 
+        change = self.change_detector
+        frame_skip = self.config.get('frame_skip', True)
+        change.frames += 1
+
+        if self.last_swap is not None and self.last_swap['output'].shape != frame.shape:
+            self.clear_swap_cache()
+
+        # Cheap check first: has anything changed under the last face ROI?
+        thumb = None
+        if frame_skip and self.last_swap is not None:
+            thumb = change.roi_thumbnail(frame, self.last_swap['rect'])
+            if not change.roi_changed(thumb):
+                change.skipped += 1
+                change.reuse_count += 1
+                return self.reuse_output(frame)
+
         # Detect face in current frame (User)
         user_landmarks = self.detector.get_landmarks(frame)
         
         if user_landmarks is None:
             # No face found, return original frame
+            self.clear_swap_cache()
             return frame
 
+        return self.swap_face(frame, user_landmarks, thumb=thumb)
+
+    def process_frames(self, frames):
+        """
+        Batch version of process_frame for offline jobs.
+        frames: (B, H, W, 3) array or list of BGR images
+        Returns a list of output frames in the same order.
+        """
+        if self.target_img is None or self.target_landmarks is None:
+            return list(frames)
+
+        landmarks_batch = self.detector.get_landmarks_batch(frames)
+
+        # Triangle vertices for every detected face in one indexing op, (K, T, 3, 2)
+        found = [lm for lm in landmarks_batch if lm is not None]
+        tri_batch = iter(np.stack(found)[:, self.target_triangles] if found else [])
+
+        outputs = []
+        for frame, user_landmarks in zip(frames, landmarks_batch):
+            self.change_detector.frames += 1
+            if self.last_swap is not None and self.last_swap['output'].shape != frame.shape:
+                self.clear_swap_cache()
+
+            if user_landmarks is None:
+                self.clear_swap_cache()
+                outputs.append(frame)
+                continue
+            outputs.append(self.swap_face(frame, user_landmarks, user_tri=next(tri_batch)))
+        return outputs
+
+    def swap_face(self, frame, user_landmarks, user_tri=None, thumb=None):
+        """
+        Warps and blends the target face onto frame at user_landmarks.
+        user_tri: Optional precomputed user triangle vertices, (T, 3, 2)
+        thumb: ROI thumbnail already computed by the change detector, if any
+        """
+        change = self.change_detector
+        frame_skip = self.config.get('frame_skip', True)
+
+        if frame_skip and self.last_swap is not None and not change.landmarks_changed(user_landmarks):
+            # Face has not moved but the pixels under it have (lighting, noise).
+            # Reuse the warped face and mask, only re-blend.
+            change.reused += 1
+            output = self.blender.seamless_clone(frame, self.last_swap['new_face'], self.last_swap['mask'], self.last_swap['center'])
+            self.last_swap['output'] = output
+            change.update(thumb=thumb)
+            return output
+
         # Prepare images
         img_target = self.target_img
         img_user = frame
         img_new_face = np.zeros_like(img_user)
         
         # Warp triangles
-        for t_indices in self.target_triangles:
-            t1 = [self.target_landmarks[i] for i in t_indices]
-            t2 = [user_landmarks[i] for i in t_indices]
-            
+        if user_tri is None:
+            user_tri = np.asarray(user_landmarks)[self.target_triangles]
+        for t1, t2 in zip(self.target_tri_pts, user_tri):
             self.swapper.warp_triangle(img_target, img_new_face, t1, t2)
 
         # Generate Mask for Seamless Cloning
@@ -103,15 +243,48 @@ class FaceSwapApp:
         # Blending
         output = self.blender.seamless_clone(img_user, img_new_face, face_mask_gray, center)
         
+        if frame_skip:
+            self.last_swap = {
+                'rect': rect,
+                'new_face': img_new_face,
+                'mask': face_mask_gray,
+                'center': center,
+                'output': output
+            }
+            change.update(thumb=change.roi_thumbnail(frame, rect), landmarks=user_landmarks)
+        
         return output
 
+    def print_metrics(self, m=None):
+        if m is None:
+            m = self.get_metrics()
+        print(f"Frames: {m['frames']}, skipped: {m['skip_rate']:.1%}, warp reused: {m['reuse_rate']:.1%}")
+
     def run(self):
         mode = self.config['mode']
         
         if mode == 'file':
             from io_module.file_processor import FileProcessor
-            processor = FileProcessor(self.config['input_source'], self.config['output_path'], self.process_frame)
-            processor.run()
+            workers = self.config.get('workers', 1)
+            if workers > 1 and self.target_img is not None and self.target_landmarks is not None:
+                from io_module.worker_pool import WorkerPool
+                assets = self.share_target_assets()
+                pool = WorkerPool(functools.partial(FaceSwapApp, self.config), assets, workers, self.config.get('worker_slots', 4))
+                # Each worker processes a contiguous run of every batch
+                batch_size = max(self.config.get('batch_size', 1), workers * self.config.get('worker_run_length', 30))
+                processor = FileProcessor(self.config['input_source'], self.config['output_path'], self.process_frame,
+                                          pool.process_frames, batch_size)
+                try:
+                    processor.run()
+                finally:
+                    pool.close()
+                    assets.close()
+                self.print_metrics(pool.metrics)
+            else:
+                processor = FileProcessor(self.config['input_source'], self.config['output_path'], self.process_frame,
+                                          self.process_frames, self.config.get('batch_size', 1))
+                processor.run()
+                self.print_metrics()
             
         elif mode == 'webcam':
             from io_module.webcam_capture import WebcamCapture
@@ -128,13 +301,14 @@ class FaceSwapApp:
                         break
                 cap.release()
                 cv2.destroyAllWindows()
+                self.print_metrics()
 
         elif mode == 'virtual':
             from io_module.webcam_capture import WebcamCapture
             from io_module.virtual_camera import VirtualCamera
             
             cap = WebcamCapture(0, self.config['width'], self.config['height'], self.config['fps'])
-            vcam = VirtualCamera(self.config['width'], self.config['height'], self.config['fps'])
+            vcam = VirtualCamera(self.config['width'], self.config['height'], self.config['fps'], self.config.get('vcam_format', 'RGB'))
             
             if cap.start() and vcam.start():
                 print("Running in Virtual Camera Mode. Press Ctrl+C to stop.")
@@ -150,6 +324,7 @@ class FaceSwapApp:
                 finally:
                     cap.release()
                     vcam.stop()
+                    self.print_metrics()
 
 if __name__ == "__main__":
     app = FaceSwapApp(CONFIG)
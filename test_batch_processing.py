@@ -0,0 +1,39 @@
+import cv2
+import numpy as np
+from config import CONFIG
+from core.face_detector import FaceDetector
+from main import FaceSwapApp
+
+def make_frames():
+    img = cv2.imread('test_assets/user_face.jpg')
+    return np.stack([np.roll(img, shift, axis=1) for shift in (0, 3, -3, 6)])
+
+def test_landmarks_batch_matches_single():
+    frames = make_frames()
+    # Same tracker state progression: one detector per API over the whole sequence
+    detector = FaceDetector()
+    single = [detector.get_landmarks(frame) for frame in frames]
+    batch = FaceDetector().get_landmarks_batch(frames)
+
+    assert len(batch) == len(frames)
+    assert single == batch
+    assert isinstance(batch[0], list) and isinstance(batch[0][0], tuple)
+    print(f"Success! Batch landmarks match for {len(frames)} frames.")
+
+def test_process_frames_matches_process_frame():
+    frames = make_frames()
+    config = dict(CONFIG, frame_skip=False)
+
+    app = FaceSwapApp(config)
+    single = [app.process_frame(frame) for frame in frames]
+    app = FaceSwapApp(config)
+    batch = app.process_frames(frames)
+
+    assert len(batch) == len(single)
+    for a, b in zip(single, batch):
+        assert np.array_equal(a, b)
+    print(f"Success! process_frames matches process_frame for {len(frames)} frames.")
+
+if __name__ == "__main__":
+    test_landmarks_batch_matches_single()
+    test_process_frames_matches_process_frame()
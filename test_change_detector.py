@@ -0,0 +1,72 @@
+import numpy as np
+from core.change_detector import ChangeDetector
+
+def make_frame():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (240, 320, 3), dtype=np.uint8)
+
+def test_static_roi_is_skipped():
+    detector = ChangeDetector()
+    frame = make_frame()
+    rect = (100, 60, 120, 140)
+    detector.update(thumb=detector.roi_thumbnail(frame, rect))
+
+    assert not detector.roi_changed(detector.roi_thumbnail(frame.copy(), rect))
+    print("Success! Unchanged ROI is skipped.")
+
+def test_local_change_is_detected():
+    detector = ChangeDetector()
+    frame = make_frame()
+    rect = (100, 60, 120, 140)
+    detector.update(thumb=detector.roi_thumbnail(frame, rect))
+
+    # A small blink-sized patch: well under the threshold as a mean over the whole ROI
+    blink = frame.copy()
+    blink[100:112, 130:150] = 0
+    thumb = detector.roi_thumbnail(blink, rect)
+    diff = np.abs(thumb.astype(np.int16) - detector.ref_thumb.astype(np.int16))
+    assert diff.mean() < detector.roi_threshold
+    assert detector.roi_changed(thumb)
+    print("Success! Local change in the face ROI is detected.")
+
+def test_max_reuse_forces_refresh():
+    detector = ChangeDetector(max_reuse=3)
+    frame = make_frame()
+    rect = (100, 60, 120, 140)
+    thumb = detector.roi_thumbnail(frame, rect)
+    detector.update(thumb=thumb)
+
+    detector.reuse_count = 2
+    assert not detector.roi_changed(thumb)
+    detector.reuse_count = 3
+    assert detector.roi_changed(thumb)
+    detector.update()
+    assert detector.reuse_count == 0
+    print("Success! max_reuse forces a full pass.")
+
+def test_landmarks_changed():
+    detector = ChangeDetector(landmark_threshold=2.5)
+    landmarks = np.array([[10, 20], [30, 40], [50, 60], [70, 80]], dtype=np.int32)
+    assert detector.landmarks_changed(landmarks)
+
+    detector.update(landmarks=landmarks)
+    # One point jumping several px is jitter, not movement
+    assert not detector.landmarks_changed(landmarks + [[0, 0], [0, 0], [0, 0], [6, 0]])
+    assert detector.landmarks_changed(landmarks + 3)
+    print("Success! Landmark threshold applied.")
+
+def test_metrics():
+    detector = ChangeDetector()
+    assert detector.metrics()['skip_rate'] == 0.0
+
+    detector.frames, detector.skipped, detector.reused = 10, 6, 2
+    m = detector.metrics()
+    assert m['skip_rate'] == 0.6 and m['reuse_rate'] == 0.2
+    print("Success! Metrics computed.")
+
+if __name__ == "__main__":
+    test_static_roi_is_skipped()
+    test_local_change_is_detected()
+    test_max_reuse_forces_refresh()
+    test_landmarks_changed()
+    test_metrics()
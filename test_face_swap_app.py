@@ -0,0 +1,70 @@
+import cv2
+import numpy as np
+from config import CONFIG
+from main import FaceSwapApp
+
+def load_frame():
+    return cv2.imread('test_assets/user_face.jpg')
+
+def test_repeated_frames_are_skipped():
+    app = FaceSwapApp(dict(CONFIG, frame_skip=True))
+    frame = load_frame()
+    first = app.process_frame(frame)
+
+    for _ in range(3):
+        assert np.array_equal(app.process_frame(frame.copy()), first)
+    m = app.get_metrics()
+    assert m['frames'] == 4 and m['skipped'] == 3 and m['reused'] == 0
+    print(f"Success! Repeated frames skipped: {m}")
+
+def test_lighting_change_reuses_warp():
+    app = FaceSwapApp(dict(CONFIG, frame_skip=True))
+    frame = load_frame()
+    app.process_frame(frame)
+    new_face = app.last_swap['new_face']
+
+    # Brighter frame: the ROI check fails but the face has not moved
+    app.process_frame(cv2.add(frame, np.full_like(frame, 20)))
+    m = app.get_metrics()
+    assert m['skipped'] == 0 and m['reused'] == 1
+    assert app.last_swap['new_face'] is new_face
+    print(f"Success! Lighting change re-blended the cached warp: {m}")
+
+def test_moved_face_forces_full_pass():
+    app = FaceSwapApp(dict(CONFIG, frame_skip=True))
+    frame = load_frame()
+    app.process_frame(frame)
+    rect = app.last_swap['rect']
+
+    app.process_frame(np.roll(frame, 20, axis=1))
+    m = app.get_metrics()
+    assert m['skipped'] == 0 and m['reused'] == 0
+    assert app.last_swap['rect'] != rect
+    print("Success! Moved face forced a full pass.")
+
+def test_cache_cleared():
+    app = FaceSwapApp(dict(CONFIG, frame_skip=True))
+    frame = load_frame()
+    calls = []
+    clear = app.clear_swap_cache
+    app.clear_swap_cache = lambda: (calls.append(1), clear())
+
+    # No face in the frame
+    app.process_frame(frame)
+    blank = np.zeros_like(frame)
+    assert np.array_equal(app.process_frame(blank), blank)
+    assert app.last_swap is None and len(calls) == 1
+
+    # Frame shape changes
+    app.process_frame(frame)
+    cropped = np.ascontiguousarray(frame[:, 40:-40])
+    output = app.process_frame(cropped)
+    assert output.shape == cropped.shape
+    assert len(calls) == 2 and app.get_metrics()['skipped'] == 0
+    print("Success! Swap cache cleared on lost face and shape change.")
+
+if __name__ == "__main__":
+    test_repeated_frames_are_skipped()
+    test_lighting_change_reuses_warp()
+    test_moved_face_forces_full_pass()
+    test_cache_cleared()
@@ -0,0 +1,198 @@
+import functools
+import multiprocessing
+import os
+import cv2
+import numpy as np
+from multiprocessing import shared_memory
+from core.shared_assets import SharedTargetAssets
+from io_module.frame_ring import SharedFrameRing, END_OF_STREAM
+from io_module.worker_pool import WorkerPool
+from config import CONFIG
+from main import FaceSwapApp
+
+SHAPE = (8, 6, 3)
+
+class StubApp:
+    # Stands in for FaceSwapApp: adds the shared 'offset' asset to each frame
+    def __init__(self, assets_descriptor, fail_on=None):
+        self.assets = SharedTargetAssets.attach(assets_descriptor)
+        self.fail_on = fail_on
+        self.frames = 0
+
+    def process_frame(self, frame):
+        if self.fail_on is not None and frame[0, 0, 0] == self.fail_on:
+            raise ValueError("stub failure")
+        self.frames += 1
+        return frame + self.assets.arrays['offset']
+
+    def get_metrics(self):
+        return {'frames': self.frames, 'skipped': 0, 'reused': 0}
+
+    def release_target_assets(self):
+        self.assets.close()
+
+def failing_factory(assets_descriptor):
+    raise RuntimeError("worker init failed")
+
+def exiting_factory(assets_descriptor):
+    # Dies without running any cleanup, like a crash in native code
+    os._exit(3)
+
+def failing_stub(assets_descriptor):
+    return StubApp(assets_descriptor, fail_on=5)
+
+def echo_ring(in_ring, out_ring):
+    while True:
+        seq, frame = in_ring.acquire_read()
+        if seq == END_OF_STREAM:
+            in_ring.release_read()
+            break
+        out_ring.put(frame + 1, seq)
+        in_ring.release_read()
+    out_ring.put_end()
+    frame = None
+    in_ring.close()
+    out_ring.close()
+
+def make_frames(n):
+    return np.stack([np.full(SHAPE, i, dtype=np.uint8) for i in range(n)])
+
+def test_shared_assets_round_trip():
+    img = np.arange(24, dtype=np.uint8).reshape(2, 4, 3)
+    triangles = np.array([[0, 1, 2], [1, 2, 3]], dtype=np.int32)
+    owner = SharedTargetAssets.create(img=img, triangles=triangles)
+
+    descriptor = owner.descriptor()
+    attached = SharedTargetAssets.attach(descriptor)
+    assert np.array_equal(attached.arrays['img'], img)
+    assert np.array_equal(attached.arrays['triangles'], triangles)
+    assert attached.arrays['triangles'].dtype == np.int32
+
+    # Same memory, not a copy
+    attached.arrays['img'][0, 0, 0] = 99
+    assert owner.arrays['img'][0, 0, 0] == 99
+
+    attached.close()
+    owner.close()
+    try:
+        shared_memory.SharedMemory(name=descriptor['img'][0])
+        assert False, "block should be unlinked"
+    except FileNotFoundError:
+        pass
+    print("Success! Shared assets round trip.")
+
+def test_frame_ring_across_processes():
+    ctx = multiprocessing.get_context('spawn')
+    in_ring = SharedFrameRing(SHAPE, slots=2, ctx=ctx)
+    out_ring = SharedFrameRing(SHAPE, slots=2, ctx=ctx)
+    p = ctx.Process(target=echo_ring, args=(in_ring, out_ring))
+    p.start()
+
+    # More frames than slots, so both rings wrap around
+    results = []
+    for i in range(5):
+        in_ring.put(np.full(SHAPE, i, dtype=np.uint8), i)
+        seq, frame = out_ring.acquire_read(timeout=10)
+        results.append((seq, int(frame[0, 0, 0])))
+        out_ring.release_read()
+    in_ring.put_end()
+    assert out_ring.acquire_read(timeout=10)[0] == END_OF_STREAM
+    out_ring.release_read()
+    p.join(10)
+
+    assert results == [(i, i + 1) for i in range(5)]
+    in_ring.close()
+    out_ring.close()
+    print("Success! Frames passed through the ring in order.")
+
+def test_worker_pool_order():
+    assets = SharedTargetAssets.create(offset=np.array([10], dtype=np.uint8))
+    pool = WorkerPool(StubApp, assets, workers=2, slots=3, poll_interval=0.1)
+    try:
+        for n in (20, 7):
+            frames = make_frames(n)
+            outputs = pool.process_frames(frames)
+            assert len(outputs) == n
+            for i, output in enumerate(outputs):
+                assert (output == i + 10).all()
+    finally:
+        pool.close()
+        assets.close()
+    # Per-worker metrics are summed when the pool shuts down
+    assert pool.metrics['frames'] == 27
+    print("Success! Worker pool keeps frame order.")
+
+def check_pool_failure(factory):
+    assets = SharedTargetAssets.create(offset=np.array([0], dtype=np.uint8))
+    pool = WorkerPool(factory, assets, workers=2, slots=3, poll_interval=0.1)
+    try:
+        pool.process_frames(make_frames(12))
+        assert False, "expected a worker failure"
+    except RuntimeError as e:
+        print(f"Success! Worker failure reported: {e}")
+    finally:
+        pool.close()
+        assets.close()
+
+def test_worker_pool_init_failure():
+    check_pool_failure(failing_factory)
+
+def test_worker_pool_frame_failure():
+    check_pool_failure(failing_stub)
+
+def test_worker_pool_worker_exit():
+    check_pool_failure(exiting_factory)
+
+def load_frames():
+    img = cv2.imread('test_assets/user_face.jpg')
+    return np.stack([np.roll(img, shift, axis=1) for shift in (0, 4, 8)])
+
+def test_face_swap_app_from_shared_assets():
+    config = dict(CONFIG, frame_skip=False)
+    loaded = FaceSwapApp(config)
+    assets = loaded.share_target_assets()
+    shared = FaceSwapApp(config, assets.descriptor())
+    try:
+        assert np.array_equal(shared.target_img, loaded.target_img)
+        assert np.array_equal(shared.target_landmarks, np.asarray(loaded.target_landmarks))
+        assert np.array_equal(shared.target_triangles, loaded.target_triangles)
+        assert np.array_equal(shared.target_tri_pts, loaded.target_tri_pts)
+
+        # load_target_face ran the target image through the tracker; do the
+        # same here so both detectors start from the same state
+        shared.detector.get_landmarks(shared.target_img)
+        for frame in load_frames():
+            assert np.array_equal(shared.process_frame(frame), loaded.process_frame(frame))
+    finally:
+        shared.release_target_assets()
+        assets.close()
+    assert shared.target_img is None and shared.shared_assets is None
+    print("Success! FaceSwapApp from shared assets matches one loaded from disk.")
+
+def test_worker_pool_with_face_swap_app():
+    config = dict(CONFIG, frame_skip=True)
+    app = FaceSwapApp(config)
+    assets = app.share_target_assets()
+    pool = WorkerPool(functools.partial(FaceSwapApp, config), assets, workers=2, slots=2)
+    frames = load_frames()
+    try:
+        outputs = pool.process_frames(frames)
+        assert outputs.shape == frames.shape
+        # Every frame has a face, so every output was swapped
+        for frame, output in zip(frames, outputs):
+            assert not np.array_equal(frame, output)
+    finally:
+        pool.close()
+        assets.close()
+    assert pool.metrics['frames'] == len(frames)
+    print(f"Success! Worker pool ran FaceSwapApp workers: {pool.metrics}")
+
+if __name__ == "__main__":
+    test_shared_assets_round_trip()
+    test_frame_ring_across_processes()
+    test_worker_pool_order()
+    test_worker_pool_init_failure()
+    test_worker_pool_frame_failure()
+    test_worker_pool_worker_exit()
+    test_face_swap_app_from_shared_assets()
+    test_worker_pool_with_face_swap_app()
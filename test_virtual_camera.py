@@ -0,0 +1,61 @@
+import time
+import numpy as np
+from io_module.virtual_camera import VirtualCamera, FakeCamera
+
+def wait_until(condition, timeout=5.0):
+    # Poll instead of sleeping a fixed time, the pacing thread may be slow to start
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the pacing thread"
+        time.sleep(0.001)
+
+def test_virtual_camera():
+    vcam = VirtualCamera(64, 48, 100, camera_factory=FakeCamera)
+    assert vcam.start()
+
+    # BGR frame at a different size: resized, then converted to RGB
+    frame = np.zeros((96, 128, 3), dtype=np.uint8)
+    frame[:, :, 0] = 255
+    vcam.send(frame)
+    wait_until(lambda: vcam.cam.frames_sent > 0)
+    vcam.stop()
+
+    cam = vcam.cam
+    last = cam.frames[-1]
+    assert last.shape == (48, 64, 3)
+    assert (last[:, :, 2] == 255).all() and (last[:, :, 0] == 0).all()
+    print(f"Success! Fake camera received {cam.frames_sent} frames.")
+
+def test_virtual_camera_passthrough():
+    vcam = VirtualCamera(64, 48, 100, fmt='BGR', camera_factory=FakeCamera)
+    assert vcam.start()
+
+    frame = np.full((48, 64, 3), 7, dtype=np.uint8)
+    vcam.send(frame)
+    wait_until(lambda: vcam.cam.frames_sent > 0)
+    vcam.stop()
+
+    assert (vcam.cam.frames[-1] == 7).all()
+    print("Success! BGR frame passed through without conversion.")
+
+def test_virtual_camera_device_error():
+    # Device expects a different size, so its send() raises on the pacing thread
+    vcam = VirtualCamera(64, 48, 100, camera_factory=lambda w, h, fps, fmt: FakeCamera(w + 1, h, fps, fmt))
+    assert vcam.start()
+
+    vcam.send(np.zeros((48, 64, 3), dtype=np.uint8))
+    # The pacing thread exits after storing the error
+    vcam._thread.join(5.0)
+    assert not vcam._thread.is_alive()
+    assert not vcam.active
+    try:
+        vcam.send(np.zeros((48, 64, 3), dtype=np.uint8))
+        assert False, "expected the device error"
+    except ValueError as e:
+        print(f"Success! Device error reported: {e}")
+    vcam.stop()
+
+if __name__ == "__main__":
+    test_virtual_camera()
+    test_virtual_camera_passthrough()
+    test_virtual_camera_device_error()